@@ -8,6 +8,8 @@ from pathlib import Path
 import os
 from datetime import timedelta
 
+from .db import parse_database_url
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -72,17 +74,43 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # --------------------------------------------------------------------
-# Database (PostgreSQL)
-# --------------------------------------------------------------------
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.getenv('DJANGO_DB_NAME', 'jobportal_db'),
-        'USER': os.getenv('DJANGO_DB_USER', 'jobportal_user'),
-        'PASSWORD': os.getenv('DJANGO_DB_PASSWORD', 'jobportal_pass'),
-        'HOST': os.getenv('DJANGO_DB_HOST', 'db'),
-        'PORT': '5432',
+# Database
+# --------------------------------------------------------------------
+# Set DATABASE_URL to pick the engine, e.g.
+#   postgres://user:pass@db:5432/jobportal_db
+#   sqlite:///db.sqlite3
+# Without it we fall back to PostgreSQL using the DJANGO_DB_* variables.
+DATABASE_URL = os.getenv('DATABASE_URL')
+
+if DATABASE_URL:
+    DATABASES = {'default': parse_database_url(DATABASE_URL, BASE_DIR)}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DJANGO_DB_NAME', 'jobportal_db'),
+            'USER': os.getenv('DJANGO_DB_USER', 'jobportal_user'),
+            'PASSWORD': os.getenv('DJANGO_DB_PASSWORD', 'jobportal_pass'),
+            'HOST': os.getenv('DJANGO_DB_HOST', 'db'),
+            'PORT': os.getenv('DJANGO_DB_PORT', '5432'),
+        }
     }
+
+USING_SQLITE = DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'
+
+# --------------------------------------------------------------------
+# Forms engine cache invalidation
+# --------------------------------------------------------------------
+# Broadcasts Page / Field / FieldOption edits to every worker so per-process
+# caches can be held indefinitely. BACKEND: 'postgres' (LISTEN/NOTIFY),
+# 'sqlite' (shared file, for tests) or empty for local-only.
+FORMS_ENGINE_INVALIDATION = {
+    'BACKEND': os.getenv(
+        'FORMS_ENGINE_INVALIDATION_BACKEND', 'sqlite' if USING_SQLITE else 'postgres'
+    ) or None,
+    'CHANNEL': 'forms_engine_invalidation',
+    # Shared SQLite file for the 'sqlite' backend; defaults to the temp dir.
+    'PATH': os.getenv('FORMS_ENGINE_INVALIDATION_PATH'),
 }
 
 # --------------------------------------------------------------------
@@ -0,0 +1,128 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from .db import parse_database_url
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class ParseDatabaseUrlTests(SimpleTestCase):
+
+    def test_sqlite_relative_path(self):
+        db = parse_database_url('sqlite:///db.sqlite3', '/srv/app')
+        self.assertEqual(db['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(db['NAME'], '/srv/app/db.sqlite3')
+
+    def test_sqlite_absolute_path(self):
+        db = parse_database_url('sqlite:////var/data/db.sqlite3', '/srv/app')
+        self.assertEqual(db['NAME'], '/var/data/db.sqlite3')
+
+    def test_sqlite_memory(self):
+        db = parse_database_url('sqlite:///:memory:', '/srv/app')
+        self.assertEqual(db['NAME'], ':memory:')
+
+    def test_sqlite_default_options(self):
+        options = parse_database_url('sqlite:///db.sqlite3', '/srv/app')['OPTIONS']
+        self.assertEqual(options, {'timeout': 5.0})
+
+    def test_sqlite_timeout_is_numeric(self):
+        options = parse_database_url('sqlite:///db.sqlite3?timeout=10', '/srv/app')['OPTIONS']
+        self.assertEqual(options['timeout'], 10.0)
+
+    def test_sqlite_rejects_bad_options(self):
+        with self.assertRaises(ValueError):
+            parse_database_url('sqlite:///db.sqlite3?timeout=soon', '/srv/app')
+        with self.assertRaises(ValueError):
+            parse_database_url('sqlite:///db.sqlite3?bogus=1', '/srv/app')
+
+    def test_postgres_with_credentials_and_port(self):
+        db = parse_database_url('postgres://user:p%40ss@db:5433/jobportal_db?sslmode=require', '/srv/app')
+        self.assertEqual(db, {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': 'jobportal_db',
+            'USER': 'user',
+            'PASSWORD': 'p@ss',
+            'HOST': 'db',
+            'PORT': '5433',
+            'OPTIONS': {'sslmode': 'require'},
+        })
+
+    def test_postgres_default_port(self):
+        db = parse_database_url('postgresql://user@db/jobportal_db', '/srv/app')
+        self.assertEqual(db['PORT'], '5432')
+
+    def test_unsupported_scheme(self):
+        with self.assertRaises(ValueError):
+            parse_database_url('mysql://user@db/jobportal_db', '/srv/app')
+
+
+class TuneSqliteTests(SimpleTestCase):
+
+    def test_pragmas_applied_on_connect(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        url = 'sqlite:///' + os.path.join(tmpdir.name, 'tuned.sqlite3')
+        # Its own alias, so the test database stays blocked for this class.
+        handler = ConnectionHandler({'default': {}, 'tuned': parse_database_url(url, tmpdir.name)})
+        connection = handler['tuned']
+        self.addCleanup(connection.close)
+
+        with connection.cursor() as cursor:
+            pragmas = {
+                name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                for name in ('journal_mode', 'synchronous', 'mmap_size', 'busy_timeout')
+            }
+        self.assertEqual(pragmas, {
+            'journal_mode': 'wal',
+            'synchronous': 1,  # NORMAL
+            'mmap_size': 256 * 1024 * 1024,
+            'busy_timeout': 5000,
+        })
+
+
+@unittest.skipUnless(shutil.which('sh'), "requires a POSIX shell")
+class EntrypointTests(SimpleTestCase):
+    """
+    Run entrypoint.sh with stub python/nc binaries on PATH. The python stub
+    hands ``python -c`` (DATABASE_URL parsing) to the real interpreter.
+    """
+
+    def run_entrypoint(self, database_url):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        calls = Path(tmpdir.name) / 'calls'
+        stubs = {
+            'python': f'[ "$1" = "-c" ] && exec "{sys.executable}" "$@"\n',
+            'nc': '',
+        }
+        for name, body in stubs.items():
+            stub = Path(tmpdir.name) / name
+            stub.write_text(f'#!/bin/sh\n{body}echo "{name} $*" >> "{calls}"\n')
+            stub.chmod(0o755)
+
+        env = dict(os.environ, PATH=f"{tmpdir.name}:{os.environ['PATH']}", DATABASE_URL=database_url)
+        proc = subprocess.run(
+            ['sh', str(BACKEND_DIR / 'entrypoint.sh')],
+            env=env, cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc.stdout, calls.read_text()
+
+    def test_sqlite_skips_waiting_for_server(self):
+        stdout, calls = self.run_entrypoint('sqlite:///db.sqlite3')
+        self.assertIn('Using SQLite database.', stdout)
+        self.assertNotIn('nc ', calls)
+        self.assertIn('python manage.py migrate --noinput', calls)
+
+    def test_postgres_waits_for_server_from_url(self):
+        stdout, calls = self.run_entrypoint('postgres://user@pg.internal:6543/jobportal_db')
+        self.assertIn('Waiting for database at pg.internal:6543', stdout)
+        self.assertIn('nc -z pg.internal 6543\n', calls)
@@ -5,12 +5,28 @@ set -e
 DB_HOST=${DJANGO_DB_HOST:-db}
 DB_PORT=${DJANGO_DB_PORT:-5432}
 
-# Wait for database to be ready
-echo "Waiting for database at $DB_HOST:$DB_PORT..."
-while ! nc -z $DB_HOST $DB_PORT; do
-  sleep 0.5
-done
-echo "Database is available."
+# Read a HOST/PORT value out of DATABASE_URL using the settings parser
+db_url_part() {
+  python -c 'import os, sys; from config.db import parse_database_url; print(parse_database_url(os.environ["DATABASE_URL"], ".")[sys.argv[1]])' "$1"
+}
+
+# Wait for database to be ready (SQLite needs no server)
+case "$DATABASE_URL" in
+  sqlite:*)
+    echo "Using SQLite database."
+    ;;
+  *)
+    if [ -n "$DATABASE_URL" ]; then
+      DB_HOST=$(db_url_part HOST)
+      DB_PORT=$(db_url_part PORT)
+    fi
+    echo "Waiting for database at $DB_HOST:$DB_PORT..."
+    while ! nc -z $DB_HOST $DB_PORT; do
+      sleep 0.5
+    done
+    echo "Database is available."
+    ;;
+esac
 
 # Apply migrations
 echo "Applying Django migrations..."
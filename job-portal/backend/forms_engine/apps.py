@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class FormsEngineConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'forms_engine'
+
+    def ready(self):
+        # Broadcast Page / Field / FieldOption edits to other workers.
+        from . import signals  # noqa: F401
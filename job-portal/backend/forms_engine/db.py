@@ -0,0 +1,24 @@
+"""
+Write helpers for the forms engine.
+
+SQLite allows a single writer at a time. FormSubmission inserts from
+threads in this process are funnelled through one lock so they queue here
+instead of spinning on "database is locked". Writers in other worker
+processes queue on SQLite's busy timeout: a lone INSERT in autocommit asks
+for the write lock straight away, so it waits rather than failing the way
+a read-then-write transaction would.
+"""
+
+import threading
+from contextlib import nullcontext
+
+from django.db import connections
+
+_sqlite_write_lock = threading.Lock()
+
+
+def serialized_write(using='default'):
+    """Context manager that serializes writes when running on SQLite."""
+    if connections[using].vendor == 'sqlite':
+        return _sqlite_write_lock
+    return nullcontext()
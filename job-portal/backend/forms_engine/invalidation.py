@@ -0,0 +1,324 @@
+"""
+Cross-process cache invalidation bus for the forms engine.
+
+Every gunicorn worker (or node) keeps its own in-memory caches of Page /
+Field / FieldOption data. When an admin edits one of those models, the
+change is broadcast on the bus and every process clears whatever it has
+registered with ``subscribe()``.
+
+Backends:
+    'postgres' - PostgreSQL LISTEN/NOTIFY (production)
+    'sqlite'   - a small events table in a local SQLite file (tests / edge)
+    None       - local process only, nothing is broadcast
+
+Configured through settings.FORMS_ENGINE_INVALIDATION.
+
+Edits are broadcast from every process, even one with no handlers of its
+own (an admin-only worker, ``manage.py shell``). Caches should subscribe
+from an AppConfig.ready(). Forked workers (gunicorn --preload) get a fresh
+ORIGIN and restart their own listener after the fork.
+
+Whenever a listener (re)connects it dispatches a RESET_EVENT, because
+events sent while it was down are lost. Handlers must treat it as
+"flush everything".
+
+Only model signals feed the bus: QuerySet.update(), bulk_create() and
+raw SQL skip it, so call publish() yourself after using them.
+"""
+
+import json
+import logging
+import os
+import select
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import closing
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BACKEND': None,
+    'CHANNEL': 'forms_engine_invalidation',
+    'PATH': os.path.join(tempfile.gettempdir(), 'jobportal_invalidation.sqlite3'),
+    'POLL_INTERVAL': 0.05,
+}
+
+
+def _new_origin():
+    return f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+# Unique per process, so a worker can ignore its own echoed events.
+# Regenerated after fork(), see _after_fork().
+ORIGIN = _new_origin()
+
+# Dispatched on every listener (re)connect: anything may have changed.
+RESET_EVENT = {'model': '*', 'pk': None, 'action': 'reset'}
+
+_handlers = []
+_handlers_lock = threading.Lock()
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'FORMS_ENGINE_INVALIDATION', {}) or {})
+    return config
+
+
+# --------------------------------------------------------------------
+# Local dispatch
+# --------------------------------------------------------------------
+def subscribe(handler):
+    """
+    Register a callable that receives every invalidation event (a dict with
+    'model', 'pk' and 'action'). Can be used as a decorator.
+    Registering the first handler starts the background listener.
+    """
+    with _handlers_lock:
+        if handler not in _handlers:
+            _handlers.append(handler)
+    get_bus().start()
+    return handler
+
+
+def unsubscribe(handler):
+    with _handlers_lock:
+        if handler in _handlers:
+            _handlers.remove(handler)
+
+
+def dispatch(event):
+    """Run every registered handler for a single event."""
+    with _handlers_lock:
+        handlers = list(_handlers)
+    for handler in handlers:
+        try:
+            handler(event)
+        except Exception:
+            logger.exception("Invalidation handler %r failed", handler)
+
+
+def has_subscribers():
+    with _handlers_lock:
+        return bool(_handlers)
+
+
+def publish(model, pk, action):
+    """
+    Invalidate local caches and broadcast the change to other processes.
+    Runs after the surrounding transaction commits, so other workers never
+    reload data that is not visible to them yet.
+    """
+    if not has_subscribers() and type(get_bus()) is BaseBus:
+        # Local-only bus and nobody local to tell.
+        return
+
+    event = {'model': model, 'pk': pk, 'action': action, 'origin': ORIGIN}
+
+    def _send():
+        dispatch(event)
+        try:
+            get_bus().send(event)
+        except Exception:
+            logger.exception("Could not broadcast invalidation event %r", event)
+
+    transaction.on_commit(_send)
+
+
+def _receive(payload):
+    try:
+        event = json.loads(payload)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring malformed invalidation payload: %r", payload)
+        return
+    if event.get('origin') == ORIGIN:
+        return
+    dispatch(event)
+
+
+# --------------------------------------------------------------------
+# Backends
+# --------------------------------------------------------------------
+class BaseBus:
+    """Local-only bus: nothing leaves the process."""
+
+    def __init__(self, config):
+        self.config = config
+        self._thread = None
+        self._stop = threading.Event()
+
+    def send(self, event):
+        pass
+
+    def listen(self):
+        pass
+
+    def start(self):
+        if type(self).listen is BaseBus.listen:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='forms-engine-invalidation', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def connected(self):
+        """Called by listen() once it is receiving again."""
+        dispatch(dict(RESET_EVENT))
+
+    def _run(self):
+        # Reconnect with a short back-off if the listener ever drops.
+        while not self._stop.is_set():
+            try:
+                self.listen()
+            except Exception:
+                logger.exception("Invalidation listener crashed, reconnecting")
+                self._stop.wait(1)
+
+
+class PostgresBus(BaseBus):
+    """Broadcast events with NOTIFY and receive them with LISTEN."""
+
+    def send(self, event):
+        with connections['default'].cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)",
+                [self.config['CHANNEL'], json.dumps(event)],
+            )
+
+    def listen(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        # Same parameters Django uses, including OPTIONS such as sslmode.
+        conn = psycopg2.connect(**connections['default'].get_connection_params())
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.config["CHANNEL"]}"')
+            self.connected()
+            while not self._stop.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _receive(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+
+class SQLiteBus(BaseBus):
+    """
+    Stand-in for LISTEN/NOTIFY: events are appended to a table in a shared
+    SQLite file and every process polls for rows newer than the last one seen.
+    """
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.path = str(config['PATH'] or DEFAULTS['PATH'])
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "channel TEXT NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def send(self, event):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO events (channel, payload, created_at) VALUES (?, ?, ?)",
+                [self.config['CHANNEL'], json.dumps(event), time.time()],
+            )
+            # Keep the table small; listeners only need recent rows.
+            conn.execute("DELETE FROM events WHERE created_at < ?", [time.time() - 3600])
+
+    def listen(self):
+        conn = self._connect()
+        try:
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+            self.connected()
+            while not self._stop.is_set():
+                rows = conn.execute(
+                    "SELECT id, payload FROM events WHERE id > ? AND channel = ? ORDER BY id",
+                    [last_id, self.config['CHANNEL']],
+                ).fetchall()
+                for row_id, payload in rows:
+                    last_id = row_id
+                    _receive(payload)
+                self._stop.wait(self.config['POLL_INTERVAL'])
+        finally:
+            conn.close()
+
+
+BACKENDS = {
+    None: BaseBus,
+    'postgres': PostgresBus,
+    'sqlite': SQLiteBus,
+}
+
+
+def get_bus():
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            config = get_config()
+            backend = config['BACKEND']
+            if backend not in BACKENDS:
+                raise ValueError(f"Unknown invalidation backend: {backend!r}")
+            _bus = BACKENDS[backend](config)
+        return _bus
+
+
+def reset_bus():
+    """Stop the listener and forget the bus (used when settings change)."""
+    global _bus
+    with _bus_lock:
+        if _bus is not None:
+            _bus.stop()
+        _bus = None
+
+
+def _after_fork():
+    """
+    Runs in the child after fork(). Threads do not survive a fork, so the
+    child drops the inherited bus, takes its own ORIGIN (otherwise sibling
+    workers would ignore each other's events) and restarts the listener.
+    """
+    global ORIGIN, _bus, _bus_lock, _handlers_lock
+    ORIGIN = _new_origin()
+    _bus = None
+    # A lock held by another thread at fork time would never be released.
+    _bus_lock = threading.Lock()
+    _handlers_lock = threading.Lock()
+    if _handlers:
+        try:
+            get_bus().start()
+        except Exception:
+            logger.exception("Could not restart invalidation listener after fork")
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,146 @@
+"""
+Benchmark submit and list throughput against a throwaway test database.
+
+    python manage.py bench_db
+    python manage.py bench_db --compare sqlite:///bench.sqlite3 \
+        postgres://jobportal_user:jobportal_pass@db:5432/jobportal_db
+
+With --compare, each DATABASE_URL is benchmarked in its own process and
+the results are printed side by side.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from forms_engine.models import Page, Field
+
+PAGE_SLUG = 'post-job'
+MANAGE_PY = Path(__file__).resolve().parents[3] / 'manage.py'
+
+
+class Command(BaseCommand):
+    help = "Measure form submit and list throughput on the configured database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help="Requests per phase.")
+        parser.add_argument('--threads', type=int, default=4, help="Concurrent clients.")
+        parser.add_argument('--compare', nargs='+', metavar='DATABASE_URL',
+                            help="Benchmark each DATABASE_URL in a subprocess.")
+        parser.add_argument('--json', action='store_true', help="Print raw results as JSON.")
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            return self.compare(options)
+
+        results = self.run_benchmark(options['requests'], options['threads'])
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+        else:
+            self.print_table([results])
+        self.check_errors([results])
+
+    # ----------------------------------------------------------------
+    def compare(self, options):
+        results = []
+        for url in options['compare']:
+            env = dict(os.environ, DATABASE_URL=url)
+            proc = subprocess.run(
+                [sys.executable, str(MANAGE_PY), 'bench_db', '--json',
+                 '--requests', str(options['requests']),
+                 '--threads', str(options['threads'])],
+                env=env, capture_output=True, text=True,
+            )
+            lines = proc.stdout.strip().splitlines()
+            if not lines:
+                # The run never got far enough to report (e.g. bad URL).
+                self.stderr.write(proc.stderr)
+                raise CommandError(f"Benchmark failed for {url}")
+            results.append(json.loads(lines[-1]))
+        self.print_table(results)
+        self.check_errors(results)
+
+    def check_errors(self, results):
+        failed = [r['engine'] for r in results if r['errors']]
+        if failed:
+            raise CommandError(f"Requests failed on: {', '.join(failed)}")
+
+    def print_table(self, results):
+        self.stdout.write(f"{'engine':<12}{'submit req/s':>14}{'list req/s':>14}{'errors':>8}")
+        for r in results:
+            self.stdout.write(
+                f"{r['engine']:<12}{r['submit_rps']:>14.1f}{r['list_rps']:>14.1f}{r['errors']:>8}"
+            )
+
+    # ----------------------------------------------------------------
+    def run_benchmark(self, total, threads):
+        settings_dict = connection.settings_dict
+        tmpdir = None
+        if connection.vendor == 'sqlite':
+            # Use a file so WAL and mmap apply (the default test DB is in memory).
+            tmpdir = tempfile.TemporaryDirectory()
+            settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tmpdir.name, 'bench.sqlite3')
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed()
+            submit_rps, submit_errors = self.measure(self.submit, total, threads)
+            list_rps, list_errors = self.measure(self.list_jobs, total, threads)
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            if tmpdir is not None:
+                tmpdir.cleanup()
+
+        return {
+            'engine': connection.vendor,
+            'submit_rps': submit_rps,
+            'list_rps': list_rps,
+            'errors': submit_errors + list_errors,
+        }
+
+    def seed(self):
+        page = Page.objects.create(name='Post Job', slug=PAGE_SLUG)
+        Field.objects.create(page=page, label='Title', name='title', field_type='text', required=True)
+        Field.objects.create(page=page, label='Description', name='description', field_type='textarea')
+
+    def measure(self, func, total, threads):
+        chunks = [range(t, total, threads) for t in range(threads)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            errors = sum(pool.map(lambda chunk: sum(run_chunk(func, chunk)), chunks))
+        elapsed = time.perf_counter() - start
+        return total / elapsed, errors
+
+    def submit(self, i):
+        response = APIClient().post(
+            f'/api/submit/{PAGE_SLUG}/',
+            {'title': f'Job {i}', 'description': 'Benchmark submission'},
+            format='json',
+        )
+        return response.status_code != 201
+
+    def list_jobs(self, i):
+        response = APIClient().get('/api/jobs/')
+        return response.status_code != 200
+
+
+def run_chunk(func, chunk):
+    """Run one client's share of requests on a single DB connection."""
+    try:
+        for i in chunk:
+            yield func(i)
+    finally:
+        connections.close_all()
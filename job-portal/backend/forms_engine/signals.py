@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save, post_delete
+
+from .models import Page, Field, FieldOption
+from .invalidation import publish
+
+# Models whose edits must reach every worker's cache.
+WATCHED_MODELS = (Page, Field, FieldOption)
+
+
+def broadcast_save(sender, instance, raw=False, **kwargs):
+    # Fixture loading (loaddata) saves raw rows; nothing is cached yet.
+    if raw:
+        return
+    publish(sender._meta.label_lower, instance.pk, 'save')
+
+
+def broadcast_delete(sender, instance, **kwargs):
+    publish(sender._meta.label_lower, instance.pk, 'delete')
+
+
+# Connected per model so unrelated models (e.g. FormSubmission) keep
+# Django's fast-delete path and never run these receivers.
+for model in WATCHED_MODELS:
+    post_save.connect(
+        broadcast_save, sender=model,
+        dispatch_uid=f'forms_engine.broadcast_save.{model._meta.label_lower}',
+    )
+    post_delete.connect(
+        broadcast_delete, sender=model,
+        dispatch_uid=f'forms_engine.broadcast_delete.{model._meta.label_lower}',
+    )
@@ -1,3 +1,249 @@
-from django.test import TestCase
+import os
+import queue
+import sqlite3
+import tempfile
+import unittest
+from contextlib import nullcontext
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.db.models.deletion import Collector
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import invalidation
+from .db import serialized_write, _sqlite_write_lock
+from .models import Page, Field, FieldOption, FormSubmission, Job
+
+
+@override_settings(FORMS_ENGINE_INVALIDATION={'BACKEND': None})
+class PublishOnChangeTests(TestCase):
+    """Saves and deletes on the watched models reach local handlers after commit."""
+
+    def setUp(self):
+        invalidation.reset_bus()
+        self.events = []
+        invalidation.subscribe(self.events.append)
+        self.addCleanup(invalidation.unsubscribe, self.events.append)
+        self.addCleanup(invalidation.reset_bus)
+
+    def test_save_publishes_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            page = Page.objects.create(name='Registration', slug='registration')
+            self.assertEqual(self.events, [])
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.events, [{
+            'model': 'forms_engine.page', 'pk': page.pk,
+            'action': 'save', 'origin': invalidation.ORIGIN,
+        }])
+
+    def test_field_and_option_changes_publish(self):
+        page = Page.objects.create(name='Registration', slug='registration')
+        with self.captureOnCommitCallbacks(execute=True):
+            field = Field.objects.create(page=page, label='Role', name='role', field_type='select')
+            option = FieldOption.objects.create(field=field, value='dev', label='Developer')
+            option.delete()
+        self.assertEqual(
+            [(e['model'], e['action']) for e in self.events],
+            [('forms_engine.field', 'save'),
+             ('forms_engine.fieldoption', 'save'),
+             ('forms_engine.fieldoption', 'delete')],
+        )
+
+    def test_unwatched_models_do_not_publish(self):
+        page = Page.objects.create(name='Registration', slug='registration')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            FormSubmission.objects.create(page=page, data={})
+            Job.objects.create(title='Dev', description='', job_type='Full-time')
+        self.assertEqual(callbacks, [])
+
+    def test_unwatched_models_keep_fast_delete(self):
+        collector = Collector(using='default')
+        self.assertTrue(collector.can_fast_delete(FormSubmission.objects.all()))
+        self.assertTrue(collector.can_fast_delete(Job.objects.all()))
+
+    def test_raw_save_is_skipped(self):
+        page = Page(name='Registration', slug='registration', created_at=timezone.now())
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            page.save_base(raw=True)
+        self.assertEqual(callbacks, [])
+
+    def test_local_only_bus_skips_without_subscribers(self):
+        invalidation.unsubscribe(self.events.append)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Page.objects.create(name='Registration', slug='registration')
+        self.assertEqual(callbacks, [])
+
+
+class BroadcastWithoutSubscribersTests(TestCase):
+    """A process with no caches of its own must still tell the others."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'bus.sqlite3')
+        override = override_settings(FORMS_ENGINE_INVALIDATION={'BACKEND': 'sqlite', 'PATH': self.path})
+        override.enable()
+        self.addCleanup(override.disable)
+        invalidation.reset_bus()
+        self.addCleanup(invalidation.reset_bus)
+
+    def test_edit_is_broadcast(self):
+        self.assertFalse(invalidation.has_subscribers())
+        with self.captureOnCommitCallbacks(execute=True):
+            page = Page.objects.create(name='Registration', slug='registration')
+        with sqlite3.connect(self.path) as conn:
+            payloads = [row[0] for row in conn.execute("SELECT payload FROM events")]
+        self.assertEqual(len(payloads), 1)
+        self.assertIn(f'"pk": {page.pk}', payloads[0])
+
+
+class SerializedWriteTests(TestCase):
+
+    def test_lock_only_on_sqlite(self):
+        if connection.vendor == 'sqlite':
+            self.assertIs(serialized_write(), _sqlite_write_lock)
+        else:
+            self.assertIsInstance(serialized_write(), nullcontext)
+
+    def test_submission_insert_goes_through_writer(self):
+        page = Page.objects.create(name='Post Job', slug='post-job')
+        writer = mock.MagicMock()
+        with mock.patch('forms_engine.views.serialized_write', return_value=writer) as patched:
+            response = self.client.post('/api/submit/post-job/', {'title': 'Dev'}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        patched.assert_called_once_with()
+        writer.__enter__.assert_called_once()
+        self.assertEqual(FormSubmission.objects.filter(page=page).count(), 1)
+
+
+class ReceiveTests(TestCase):
+
+    def setUp(self):
+        self.events = []
+        with override_settings(FORMS_ENGINE_INVALIDATION={'BACKEND': None}):
+            invalidation.reset_bus()
+            invalidation.subscribe(self.events.append)
+        self.addCleanup(invalidation.unsubscribe, self.events.append)
+        self.addCleanup(invalidation.reset_bus)
+
+    def test_own_origin_is_ignored(self):
+        invalidation._receive('{"model": "forms_engine.page", "pk": 1, "origin": "%s"}' % invalidation.ORIGIN)
+        self.assertEqual(self.events, [])
+
+    def test_other_origin_is_dispatched(self):
+        invalidation._receive('{"model": "forms_engine.page", "pk": 1, "origin": "other"}')
+        self.assertEqual(self.events, [{'model': 'forms_engine.page', 'pk': 1, 'origin': 'other'}])
+
+    def test_malformed_payload_is_ignored(self):
+        with self.assertLogs('forms_engine.invalidation', 'WARNING'):
+            invalidation._receive('not json')
+        self.assertEqual(self.events, [])
+
+
+class ForkTests(TestCase):
+
+    def setUp(self):
+        self.events = []
+        with override_settings(FORMS_ENGINE_INVALIDATION={'BACKEND': None}):
+            invalidation.reset_bus()
+            invalidation.subscribe(self.events.append)
+        self.addCleanup(invalidation.unsubscribe, self.events.append)
+        self.addCleanup(invalidation.reset_bus)
+
+    def test_after_fork_resets_origin_and_bus(self):
+        origin, bus = invalidation.ORIGIN, invalidation.get_bus()
+        with override_settings(FORMS_ENGINE_INVALIDATION={'BACKEND': None}):
+            invalidation._after_fork()
+            self.assertIsNot(invalidation.get_bus(), bus)
+        self.assertNotEqual(invalidation.ORIGIN, origin)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork()")
+    def test_forked_child_gets_own_origin(self):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, invalidation.ORIGIN.encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            child_origin = pipe.read()
+        os.waitpid(pid, 0)
+        self.assertTrue(child_origin)
+        self.assertNotEqual(child_origin, invalidation.ORIGIN)
+
+
+class SQLiteBusTests(TestCase):
+    """Two SQLiteBus instances on one file behave like two workers."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.config = dict(invalidation.DEFAULTS, PATH=os.path.join(tmpdir.name, 'bus.sqlite3'))
+
+        self.received = queue.Queue()
+        with override_settings(FORMS_ENGINE_INVALIDATION={'BACKEND': None}):
+            invalidation.reset_bus()
+            invalidation.subscribe(self.received.put)
+        self.addCleanup(invalidation.unsubscribe, self.received.put)
+        self.addCleanup(invalidation.reset_bus)
+
+        self.sender = invalidation.SQLiteBus(self.config)
+        self.listener = invalidation.SQLiteBus(self.config)
+        self.listener.start()
+        self.addCleanup(self.listener.stop)
+
+    def test_connect_dispatches_reset(self):
+        self.assertEqual(self.received.get(timeout=2)['action'], 'reset')
+
+    def test_event_reaches_other_instance(self):
+        self.received.get(timeout=2)  # reset on connect
+        event = {'model': 'forms_engine.page', 'pk': 7, 'action': 'save', 'origin': 'other'}
+        self.sender.send(event)
+        self.assertEqual(self.received.get(timeout=2), event)
+
+    def test_own_events_are_not_echoed(self):
+        self.received.get(timeout=2)  # reset on connect
+        self.sender.send({'model': 'forms_engine.page', 'pk': 1, 'action': 'save',
+                          'origin': invalidation.ORIGIN})
+        event = {'model': 'forms_engine.field', 'pk': 2, 'action': 'delete', 'origin': 'other'}
+        self.sender.send(event)
+        self.assertEqual(self.received.get(timeout=2), event)
+
+    def test_reconnect_dispatches_reset(self):
+        self.received.get(timeout=2)
+        self.listener.stop()
+        self.listener.start()
+        self.assertEqual(self.received.get(timeout=2)['action'], 'reset')
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "requires a postgres DATABASE_URL")
+class PostgresBusTests(TransactionTestCase):
+    """NOTIFY is only delivered on commit, hence TransactionTestCase."""
+
+    def setUp(self):
+        self.received = queue.Queue()
+        with override_settings(FORMS_ENGINE_INVALIDATION={'BACKEND': None}):
+            invalidation.reset_bus()
+            invalidation.subscribe(self.received.put)
+        self.addCleanup(invalidation.unsubscribe, self.received.put)
+        self.addCleanup(invalidation.reset_bus)
+
+        config = dict(invalidation.DEFAULTS, CHANNEL='forms_engine_invalidation_test')
+        self.sender = invalidation.PostgresBus(config)
+        self.listener = invalidation.PostgresBus(config)
+        self.listener.start()
+        self.addCleanup(self.listener.stop)
+
+    def test_event_reaches_other_instance(self):
+        self.assertEqual(self.received.get(timeout=5)['action'], 'reset')
+        event = {'model': 'forms_engine.page', 'pk': 7, 'action': 'save', 'origin': 'other'}
+        self.sender.send(event)
+        self.assertEqual(self.received.get(timeout=5), event)
+
+    def test_reconnect_dispatches_reset(self):
+        self.assertEqual(self.received.get(timeout=5)['action'], 'reset')
+        self.listener.stop()
+        self.listener.start()
+        self.assertEqual(self.received.get(timeout=5)['action'], 'reset')
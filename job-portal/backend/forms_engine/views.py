@@ -10,6 +10,7 @@ from .models import Job
 from .serializers import JobSerializer
 from rest_framework.decorators import api_view
 from .models import FormSubmission
+from .db import serialized_write
 
 class PageListView(generics.ListAPIView):
     """List all available pages (Registration, Login, etc.)"""
@@ -49,8 +50,9 @@ class FormSubmissionView(APIView):
         if errors:
             return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Store submission as JSON
-        submission = FormSubmission.objects.create(page=page, data=data)
+        # Store submission as JSON (one writer at a time on SQLite)
+        with serialized_write():
+            submission = FormSubmission.objects.create(page=page, data=data)
         serializer = FormSubmissionSerializer(submission)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 